@@ -5,7 +5,7 @@ An Analysis holds configuration, metrics and the generated results.
 # Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
 # License: MIT
 
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Tuple
 import logging
 from datetime import datetime, timedelta
 import os
@@ -115,6 +115,7 @@ class Analysis:
 
         # memoization
         self.scanned_files_nodes_in_directories = {}
+        self._parent_source_directory_path: Optional[Tuple[str, str]] = None
 
         self.local_metric_results: Dict[str, Dict[str, Any]] = {}
         self.overall_metric_results: Dict[str, Any] = {}
@@ -326,6 +327,15 @@ class Analysis:
                 f'copy the following path to your browser and start your web app: 👉 file://{resolved_export_path}/html/emerge.html')
             LOGGER.info_done('... also tried to copy the link to your pasteboard, just try to paste it in your browser 🚀')
 
+    @property
+    def parent_source_directory_path(self) -> str:
+        """Returns the parent directory of the source directory with a trailing slash, which is the base for all relative analysis paths.
+        This is needed for every scanned file, so it is only computed again if the source directory changes.
+        """
+        if self._parent_source_directory_path is None or self._parent_source_directory_path[0] != self.source_directory:
+            self._parent_source_directory_path = (self.source_directory, f"{Path(self.source_directory).parent}/")
+        return self._parent_source_directory_path[1]
+
     @property
     def entity_results(self) -> Dict[str, AbstractEntityResult]:
         """Returns a dictionary of all entity results from this analysis.
@@ -437,7 +447,7 @@ class Analysis:
 
         # create a root directory filesystem node, add to project graph
 
-        parent_analysis_source_path = f"{Path(self.source_directory).parent}/"
+        parent_analysis_source_path = self.parent_source_directory_path
         relative_file_path_to_analysis = self.source_directory.replace(parent_analysis_source_path, "")
 
         filesystem_root_node = FileSystemNode(FileSystemNodeType.DIRECTORY, relative_file_path_to_analysis)
@@ -462,9 +472,9 @@ class Analysis:
                 # create relative analysis paths to exactly match the same path of nodes in other graphs (and get their metrics)
                 parent_analysis_source_path = f"{Path(absolute_path_to_directory).parent}/"
                 relative_file_path_to_analysis = absolute_path_to_directory.replace(parent_analysis_source_path, "")
-                relative_path_parent = f'{Path(root)}'.replace(f'{ Path(self.source_directory).parent}/', "")
+                relative_path_parent = f'{Path(root)}'.replace(self.parent_source_directory_path, "")
                 relative_path_directoy_node = f'{Path(root)}/{relative_file_path_to_analysis}'.replace(
-                    f"{Path(self.source_directory).parent}/", "")
+                    self.parent_source_directory_path, "")
 
                 directory_node = FileSystemNode(FileSystemNodeType.DIRECTORY, relative_path_directoy_node)
                 filesystem_graph.filesystem_nodes[directory_node.absolute_name] = directory_node
@@ -508,8 +518,8 @@ class Analysis:
 
                 # create relative analysis path to exactly match the same path of nodes in other graphs (and get their metrics)
                 parent_analysis_source_path = f"{Path(absolute_path_to_file).parent}/"
-                relative_root = f'{Path(root)}'.replace(f'{ Path(self.source_directory).parent}/', "")
-                relative_file_path_to_analysis = absolute_path_to_file.replace(f'{Path(self.source_directory).parent}/', "")
+                relative_root = f'{Path(root)}'.replace(self.parent_source_directory_path, "")
+                relative_file_path_to_analysis = absolute_path_to_file.replace(self.parent_source_directory_path, "")
 
                 if not self.file_extension_allowed(file_extension):
                     if not file_extension.strip():
@@ -56,6 +56,9 @@ class LanguageExtension(Enum):
     RUBY = '.rb'
     C_HEADER = '.h'
     CPP_HEADER = '.hpp'
+    CPP_HEADER_HH = '.hh'
+    CPP_HEADER_HXX = '.hxx'
+    CPP_HEADER_HPLUSPLUS = '.h++'
     PYTHON = '.py'
     GO = '.go'
 
@@ -79,6 +82,16 @@ class LanguageExtension(Enum):
             return False
 
 
+# all header extensions that can be scanned by the C, C++ or Objective-C parser, depending on the permitted languages
+HEADER_EXTENSIONS = frozenset({
+    LanguageExtension.C_HEADER.value,
+    LanguageExtension.CPP_HEADER.value,
+    LanguageExtension.CPP_HEADER_HH.value,
+    LanguageExtension.CPP_HEADER_HXX.value,
+    LanguageExtension.CPP_HEADER_HPLUSPLUS.value
+})
+
+
 class FileScanMapper:
     @staticmethod
     def choose_parser(file_extension, only_permit_languages=None) -> Optional[str]:
@@ -110,7 +123,7 @@ class FileScanMapper:
             return PythonParser.parser_name()
         if file_extension == LanguageExtension.GO.value:
             return GoParser.parser_name()
-        if file_extension == LanguageExtension.C_HEADER.value or LanguageExtension.CPP_HEADER.value:
+        if file_extension in HEADER_EXTENSIONS:
             if only_permit_languages:
                 if 'objc' in only_permit_languages:
                     return ObjCParser.parser_name()
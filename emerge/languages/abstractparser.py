@@ -250,6 +250,12 @@ class ParsingMixin(ABC):
             file_content = file_content.replace(origin, mapped)
         return re.findall(r'\S+|\n', file_content)
 
+    @classmethod
+    def preprocess_file_content_and_generate_token_list_by_translation(cls, file_content: str,
+                                                                       translation_table: Dict[int, str]) -> List[str]:
+        """Same as the mapping based token generation, but maps all single characters in one pass with a table from str.maketrans()."""
+        return re.findall(r'\S+|\n', file_content.translate(translation_table))
+
 
 class AbstractParser(ParsingMixin, ABC):
 
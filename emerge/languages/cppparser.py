@@ -5,16 +5,19 @@ Contains the implementation of the C++ language parser and a relevant keyword en
 # Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
 # License: MIT
 
-from typing import Dict
+from typing import Dict, List, Tuple
 from enum import Enum, unique
 import logging
-from pathlib import Path
+import re
+import functools
 import os
+import sys
 
 import pyparsing as pp
 import coloredlogs
 
 from emerge.languages.abstractparser import AbstractParser, ParsingMixin, Parser, CoreParsingKeyword, LanguageType
+from emerge.languages.parsercache import ParserCache
 from emerge.results import FileResult
 from emerge.abstractresult import AbstractResult, AbstractFileResult, AbstractEntityResult
 from emerge.log import Logger
@@ -34,8 +37,38 @@ class CPPParsingKeyword(Enum):
     STOP_BLOCK_COMMENT = "*/"
 
 
+# the include grammar never changes, so build it once instead of for every #include token
+_INCLUDE_NAME = pp.Word(pp.alphanums + CoreParsingKeyword.DOT.value + CoreParsingKeyword.SLASH.value +
+                        CoreParsingKeyword.DOUBLE_QUOTE.value + CoreParsingKeyword.UNDERSCORE.value)
+
+_INCLUDE_PATTERN = pp.Keyword(CPPParsingKeyword.INCLUDE.value) + \
+    pp.ZeroOrMore(pp.Suppress(CoreParsingKeyword.OPENING_ANGLE_BRACKET.value) |
+                  pp.Suppress(CoreParsingKeyword.CLOSING_ANGLE_BRACKET.value) |
+                  pp.Suppress(CoreParsingKeyword.DOUBLE_QUOTE.value)) + \
+    _INCLUDE_NAME.setResultsName(CoreParsingKeyword.IMPORT_ENTITY_NAME.value)
+
+# finds every include directive in a single pass over the source, the remainder of the line is captured for further matching
+_INCLUDE_DIRECTIVE_RE = re.compile(r'^[ \t]*#[ \t]*include\b(.*)$', re.MULTILINE)
+
+# matches the common '<name>' / '"name"' forms of an include directive, only exotic forms like 'SOME_MACRO' need pyparsing
+_INCLUDE_RE = re.compile(r'[ \t]*[<"]([^">\n]+)[">]')
+
+# matches line and block comments in one pass, string/char literals are matched as well to keep e.g. "http://..." intact,
+# char literals are limited to a few characters, so that C++14 digit separators like 1'000 never start a false literal
+_COMMENT_RE = re.compile(r'("(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n]){1,8}\')|//[^\n]*|/\*.*?\*/', re.DOTALL)
+
+
+@functools.lru_cache(maxsize=None)
+def _path_exists(path: str) -> bool:
+    """The same headers are included by many files, so only check the filesystem once per candidate path."""
+    return os.path.exists(path)
+
+
 class CPPParser(AbstractParser, ParsingMixin):
 
+    # bump this whenever the tokenization or include extraction changes, to invalidate all persistent cache entries
+    PARSER_CACHE_VERSION = 5
+
     def __init__(self):
         self._results: Dict[str, AbstractResult] = {}
         self._token_mappings: Dict[str, str] = {
@@ -54,6 +87,9 @@ class CPPParser(AbstractParser, ParsingMixin):
             '>': ' > ',
             '"': ' " '
         }
+        # all mapping keys are single characters, so they can be mapped in one pass with str.translate
+        self._token_translation_table: Dict[int, str] = str.maketrans(self._token_mappings)
+        self._parser_cache = ParserCache('cpp-parser', self.PARSER_CACHE_VERSION) if ParserCache.is_enabled() else None
 
     @classmethod
     def parser_name(cls) -> str:
@@ -73,11 +109,47 @@ class CPPParser(AbstractParser, ParsingMixin):
 
     def generate_file_result_from_analysis(self, analysis, *, file_name: str, full_file_path: str, file_content: str) -> None:
         LOGGER.debug('generating file results...')
-        scanned_tokens = self.preprocess_file_content_and_generate_token_list_by_mapping(file_content, self._token_mappings)
-
+        scanned_tokens, include_names = self._scan_file_content(file_name, file_content, analysis.statistics)
+        self._create_file_result(analysis, file_name, full_file_path, file_content, scanned_tokens, include_names)
+
+    def _scan_file_content(self, file_name: str, file_content: str, statistics: Statistics) -> Tuple[List[str], List[str]]:
+        """Returns the scanned tokens and the unresolved include names of a file, both only depend on the file content."""
+        # tokens and include names can therefore be reused from the persistent cache, the parsing statistics are replayed on a hit
+        if self._parser_cache is not None:
+            cache_key = self._parser_cache.key(file_content)
+            if (cached_payload := self._parser_cache.get(cache_key)) is not None:
+                self._update_parsing_statistics(statistics, cached_payload['parsing_hits'], cached_payload['parsing_misses'])
+                return cached_payload['scanned_tokens'], cached_payload['include_names']
+
+        scanned_tokens = self.preprocess_file_content_and_generate_token_list_by_translation(file_content, self._token_translation_table)
+        include_names, parsing_hits, parsing_misses = self._extract_include_names(file_name, file_content)
+        self._update_parsing_statistics(statistics, parsing_hits, parsing_misses)
+
+        if self._parser_cache is not None:
+            self._parser_cache.put(cache_key, {
+                'scanned_tokens': scanned_tokens,
+                'include_names': include_names,
+                'parsing_hits': parsing_hits,
+                'parsing_misses': parsing_misses
+            })
+
+        return scanned_tokens, include_names
+
+    @staticmethod
+    def _update_parsing_statistics(statistics: Statistics, parsing_hits: int, parsing_misses: int) -> None:
+        # only touch counters that changed, so that the statistics keys only appear once something was parsed
+        if parsing_hits:
+            statistics.increment(Statistics.Key.PARSING_HITS, parsing_hits)
+        if parsing_misses:
+            statistics.increment(Statistics.Key.PARSING_MISSES, parsing_misses)
+
+    def _create_file_result(self, analysis, file_name: str, full_file_path: str, file_content: str,
+                            scanned_tokens: List[str], include_names: List[str]) -> None:
         # make sure to create unique names by using the relative analysis path as a base for the result
-        parent_analysis_source_path = f"{Path(analysis.source_directory).parent}/"
-        relative_file_path_to_analysis = full_file_path.replace(parent_analysis_source_path, "")
+        parent_analysis_source_path = analysis.parent_source_directory_path
+        relative_file_path_to_analysis = full_file_path
+        if full_file_path.startswith(parent_analysis_source_path):
+            relative_file_path_to_analysis = full_file_path[len(parent_analysis_source_path):]
 
         file_result = FileResult.create_file_result(
             analysis=analysis,
@@ -94,7 +166,7 @@ class CPPParser(AbstractParser, ParsingMixin):
         )
 
         self._add_package_name_to_result(file_result)
-        self._add_imports_to_result(file_result, analysis)
+        self._add_imports_to_result(file_result, analysis, include_names)
         self._results[file_result.unique_name] = file_result
 
     def after_generated_file_results(self, analysis) -> None:
@@ -106,58 +178,68 @@ class CPPParser(AbstractParser, ParsingMixin):
     def create_unique_entity_name(self, entity: AbstractEntityResult) -> None:
         raise NotImplementedError(f'currently not implemented in {self.parser_name()}')
 
-    def _add_imports_to_result(self, result: AbstractFileResult, analysis):
-        LOGGER.debug(f'extracting imports from file result {result.scanned_file_name}...')
-        list_of_words_with_newline_strings = result.scanned_tokens
-        
-        source_string_no_comments = self._filter_source_tokens_without_comments(
-            list_of_words_with_newline_strings,
-            CPPParsingKeyword.INLINE_COMMENT.value,
-            CPPParsingKeyword.START_BLOCK_COMMENT.value,
-            CPPParsingKeyword.STOP_BLOCK_COMMENT.value
-        )
+    def _extract_include_names(self, file_name: str, file_content: str) -> Tuple[List[str], int, int]:
+        """Extracts the unresolved names of all #include directives from the content of a file.
+        Also returns the number of parsing hits and misses, so that they can be stored in the parser cache as well.
+        """
+        LOGGER.debug('extracting imports from file %s...', file_name)
+        include_names: List[str] = []
 
-        filtered_list_no_comments = self.preprocess_file_content_and_generate_token_list_by_mapping(source_string_no_comments, self._token_mappings)
+        # count locally, the statistics are updated once per file by the caller
+        parsing_hits = parsing_misses = 0
 
-        for _, obj, following in self._gen_word_read_ahead(filtered_list_no_comments):
-            if obj == CPPParsingKeyword.INCLUDE.value:
-                read_ahead_string = self.create_read_ahead_string(obj, following)
+        # cheap substring pre-filter, skips comment stripping for files without any include directive
+        if 'include' not in file_content:
+            return include_names, parsing_hits, parsing_misses
 
-                include_name = pp.Word(pp.alphanums + CoreParsingKeyword.DOT.value + CoreParsingKeyword.SLASH.value +
-                                       CoreParsingKeyword.DOUBLE_QUOTE.value + CoreParsingKeyword.UNDERSCORE.value)
+        source_string_no_comments = self._strip_cpp_comments(file_content)
 
-                expression_to_match = pp.Keyword(CPPParsingKeyword.INCLUDE.value) + \
-                    pp.ZeroOrMore(pp.Suppress(CoreParsingKeyword.OPENING_ANGLE_BRACKET.value) |
-                                  pp.Suppress(CoreParsingKeyword.CLOSING_ANGLE_BRACKET.value) |
-                                  pp.Suppress(CoreParsingKeyword.DOUBLE_QUOTE.value)) + \
-                    include_name.setResultsName(CoreParsingKeyword.IMPORT_ENTITY_NAME.value)
+        for directive in _INCLUDE_DIRECTIVE_RE.finditer(source_string_no_comments):
+            include_arguments = directive.group(1)
 
+            # only fall back to pyparsing if the include is not trivially recognizable, e.g. '#include SOME_MACRO'
+            if (match := _INCLUDE_RE.match(include_arguments)) is not None:
+                dependency = match.group(1).strip()
+            else:
+                following = self.preprocess_file_content_and_generate_token_list_by_translation(include_arguments,
+                                                                                                self._token_translation_table)
+                read_ahead_string = self.create_read_ahead_string(CPPParsingKeyword.INCLUDE.value, following)
                 try:
-                    parsing_result = expression_to_match.parseString(read_ahead_string)
+                    parsing_result = _INCLUDE_PATTERN.parseString(read_ahead_string)
                 except pp.ParseException as exception:
-                    result.analysis.statistics.increment(Statistics.Key.PARSING_MISSES)
-                    LOGGER.warning(f'warning: could not parse result {result=}\n{exception}')
-                    LOGGER.warning(f'next tokens: {[obj] + following[:ParsingMixin.Constants.MAX_DEBUG_TOKENS_READAHEAD.value]}')
+                    parsing_misses += 1
+                    LOGGER.warning('warning: could not parse include in %s\n%s', file_name, exception)
+                    LOGGER.warning('next tokens: %s %s', CPPParsingKeyword.INCLUDE.value, following)
                     continue
 
-                analysis.statistics.increment(Statistics.Key.PARSING_HITS)
-
-                # ignore any dependency substring from the config ignore list
                 dependency = getattr(parsing_result, CoreParsingKeyword.IMPORT_ENTITY_NAME.value)
 
-                # try to resolve the dependency
-                resolved_dependency = self.try_resolve_dependency(dependency, result, analysis)
+            parsing_hits += 1
+            include_names.append(dependency)
+
+        return include_names, parsing_hits, parsing_misses
+
+    @staticmethod
+    def _strip_cpp_comments(source: str) -> str:
+        """Replaces all comments with whitespace, newlines inside block comments are kept to preserve the line structure."""
+        return _COMMENT_RE.sub(lambda match: match.group(1) or ' ' + '\n' * match.group().count('\n'), source)
+
+    def _add_imports_to_result(self, result: AbstractFileResult, analysis, include_names: List[str]):
+        for dependency in include_names:
+            # try to resolve the dependency
+            resolved_dependency = self.try_resolve_dependency(dependency, result, analysis)
 
-                if self._is_dependency_in_ignore_list(resolved_dependency, analysis):
-                    LOGGER.debug(f'ignoring dependency from {result.unique_name} to {resolved_dependency}')
-                else:
-                    result.scanned_import_dependencies.append(resolved_dependency)
-                    LOGGER.debug(f'adding import: {resolved_dependency}')
+            if self._is_dependency_in_ignore_list(resolved_dependency, analysis):
+                LOGGER.debug('ignoring dependency from %s to %s', result.unique_name, resolved_dependency)
+            else:
+                # the same headers are included by many files, so share a single string object per dependency
+                result.scanned_import_dependencies.append(sys.intern(resolved_dependency))
+                LOGGER.debug('adding import: %s', resolved_dependency)
 
     def try_resolve_dependency(self, dependency: str, result: AbstractFileResult, analysis) -> str:
         resolved_dependency = self.resolve_relative_dependency_path(dependency, str(result.absolute_dir_path), analysis.source_directory)
-        check_dependency_path = f"{ Path(analysis.source_directory).parent}/{resolved_dependency}"
-        if os.path.exists(check_dependency_path):
+        check_dependency_path = f"{analysis.parent_source_directory_path}{resolved_dependency}"
+        if _path_exists(check_dependency_path):
             dependency = resolved_dependency
         return dependency
 
@@ -0,0 +1,79 @@
+"""
+Contains a simple persistent on-disk cache for parser results that only depend on the file content.
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+from typing import Any, Optional
+from pathlib import Path
+import contextlib
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+
+import coloredlogs
+
+from emerge.log import Logger
+
+LOGGER = Logger(logging.getLogger('parser'))
+coloredlogs.install(level='E', logger=LOGGER.logger(), fmt=Logger.log_format)
+
+
+class ParserCache:
+    """Stores pickled parser payloads under '<cache directory>/<name>/<sha256>.pkl', keyed by the file content and a cache version.
+    The cache is opt-in and only active if the environment variable EMERGE_PARSER_CACHE is set,
+    the location can be changed with EMERGE_PARSER_CACHE_DIR (see README.md).
+    Bumping the version of a parser cache invalidates all of its existing entries.
+    """
+
+    ENABLE_ENVIRONMENT_VARIABLE = 'EMERGE_PARSER_CACHE'
+    DIRECTORY_ENVIRONMENT_VARIABLE = 'EMERGE_PARSER_CACHE_DIR'
+
+    def __init__(self, name: str, version: int, cache_directory: Optional[str] = None):
+        if cache_directory is None:
+            cache_directory = os.environ.get(self.DIRECTORY_ENVIRONMENT_VARIABLE)
+        if cache_directory is None:
+            cache_directory = f"{os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')}/emerge"
+
+        self._directory = Path(cache_directory) / name
+        self._version = version
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return bool(os.environ.get(cls.ENABLE_ENVIRONMENT_VARIABLE))
+
+    def key(self, file_content: str) -> str:
+        """Creates a cache key from the SHA256 of the given file content and the cache version."""
+        content_hash = hashlib.sha256(f'{self._version}\n'.encode('utf-8'))
+        content_hash.update(file_content.encode('utf-8', errors='surrogatepass'))
+        return content_hash.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached payload for a key or None, if there is no (readable) entry."""
+        try:
+            with open(self._directory / f'{key}.pkl', 'rb') as file:
+                return pickle.load(file)
+        except FileNotFoundError:
+            return None
+        # pylint: disable=broad-except
+        except Exception as ex:
+            LOGGER.warning('could not read parser cache entry %s: %s', key, ex)
+            return None
+
+    def put(self, key: str, payload: Any) -> None:
+        """Stores a payload for a key. Writes to a temporary file first, so that concurrent readers never see a partial entry."""
+        temporary_file_name = None
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=self._directory, suffix='.tmp', delete=False) as file:
+                temporary_file_name = file.name
+                pickle.dump(payload, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_file_name, self._directory / f'{key}.pkl')
+        except (OSError, pickle.PicklingError) as ex:
+            if temporary_file_name is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(temporary_file_name)
+            LOGGER.warning('could not write parser cache entry %s: %s', key, ex)
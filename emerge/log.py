@@ -32,6 +32,7 @@ class LogState(Enum):
 
 class Logger:
     """A simple ✅-driven logger class that can log messages in a nice way related to the log level.
+    Optional args are passed on lazily, e.g. LOGGER.debug('adding import: %s', name) is only formatted if the message is emitted.
     """
     level: LogLevel = LogLevel.ERROR
     state: LogState = LogState.ON
@@ -43,23 +44,23 @@ class Logger:
     def __init__(self, logger):
         self._logger = logger
 
-    def info(self, message: str):
-        self._logger.info("\U000023E9" + " " + message)
+    def info(self, message: str, *args):
+        self._logger.info("\U000023E9" + " " + message, *args)
 
-    def info_start(self, message: str):
-        self._logger.info("\U0001F449" + " " + message)
+    def info_start(self, message: str, *args):
+        self._logger.info("\U0001F449" + " " + message, *args)
 
-    def debug(self, message: str):
-        self._logger.debug("\U000023E9" + " " + message)
+    def debug(self, message: str, *args):
+        self._logger.debug("\U000023E9" + " " + message, *args)
 
-    def error(self, message: str):
-        self._logger.error("\U00002757" + " " + message)
+    def error(self, message: str, *args):
+        self._logger.error("\U00002757" + " " + message, *args)
 
-    def warning(self, message: str):
-        self._logger.debug("\U00002753" + " " + message)
+    def warning(self, message: str, *args):
+        self._logger.debug("\U00002753" + " " + message, *args)
 
-    def info_done(self, message: str):
-        self._logger.info("\U00002705" + " " + message)
+    def info_done(self, message: str, *args):
+        self._logger.info("\U00002705" + " " + message, *args)
 
     def logger(self):
         return self._logger
@@ -176,7 +176,7 @@ class FileResult(AbstractFileResult, ParsingMixin):
                  ):
         self._analysis = anaylsis
         self._scanned_file_name = scanned_file_name
-        self._absolute_dir_path = Path(f'{ Path(anaylsis.source_directory).parent}/{Path(absolute_name).parent}')
+        self._absolute_dir_path = Path(f'{anaylsis.parent_source_directory_path}{Path(absolute_name).parent}')
         self._relative_file_path_to_analysis = relative_file_path_to_analysis
         self._relative_analysis_path = Path(relative_file_path_to_analysis).parent
         self._absolute_name = absolute_name
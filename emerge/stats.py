@@ -53,8 +53,8 @@ class Statistics:
     def update(self, *, key, value: Any) -> None:
         self.data[key.name.lower()] = value
 
-    def increment(self, key) -> None:
+    def increment(self, key, delta: int = 1) -> None:
         if (k := key.name.lower()) not in self.data:
-            self.data[k] = 1
+            self.data[k] = delta
         else:
-            self.data[k] += 1
+            self.data[k] += delta
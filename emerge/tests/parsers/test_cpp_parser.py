@@ -5,7 +5,10 @@ All unit tests that are related to CPPParser.
 # Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
 # License: MIT
 
+import os
+import tempfile
 import unittest
+from unittest import mock
 from typing import Dict
 
 from tests.testdata.cpp import CPP_TEST_FILES
@@ -28,6 +31,18 @@ class CPPParserTestCase(unittest.TestCase):
     def tearDown(self):
         pass
 
+    @staticmethod
+    def _create_analysis() -> Analysis:
+        analysis = Analysis()
+        analysis.analysis_name = "test"
+        analysis.source_directory = "/tests"
+        return analysis
+
+    def _generate_file_results(self, parser: CPPParser, analysis: Analysis) -> None:
+        for file_name, file_content in self.example_data.items():
+            parser.generate_file_result_from_analysis(analysis, file_name=file_name, full_file_path="/tests/" + file_name,
+                                                      file_content=file_content)
+
     def test_generate_file_results(self):
         """Generate file results and check basic attributes."""
         self.assertFalse(self.parser.results)
@@ -48,3 +63,70 @@ class CPPParserTestCase(unittest.TestCase):
             self.assertTrue(result.scanned_file_name.strip())
             self.assertTrue(result.scanned_by.strip())
             self.assertTrue(result.scanned_language == LanguageType.CPP)
+
+    def test_generate_file_results_from_parser_cache(self):
+        """Generate file results with and without the parser cache and check that cache hits skip parsing, but lead to equal results."""
+        with mock.patch.dict(os.environ, {'EMERGE_PARSER_CACHE': ''}):
+            uncached_parser = CPPParser()
+        uncached_analysis = self._create_analysis()
+        self._generate_file_results(uncached_parser, uncached_analysis)
+
+        with tempfile.TemporaryDirectory() as cache_directory:
+            with mock.patch.dict(os.environ, {'EMERGE_PARSER_CACHE': '1', 'EMERGE_PARSER_CACHE_DIR': cache_directory}):
+                warming_parser = CPPParser()
+                cached_parser = CPPParser()
+
+            self._generate_file_results(warming_parser, self._create_analysis())
+            self.assertEqual(len(os.listdir(os.path.join(cache_directory, 'cpp-parser'))), len(self.example_data))
+
+            # every file is now cached, so neither tokenization nor include extraction must run again
+            cached_analysis = self._create_analysis()
+            with mock.patch.object(cached_parser, 'preprocess_file_content_and_generate_token_list_by_translation') as tokenize, \
+                    mock.patch.object(cached_parser, '_extract_include_names') as extract_include_names:
+                self._generate_file_results(cached_parser, cached_analysis)
+            tokenize.assert_not_called()
+            extract_include_names.assert_not_called()
+
+        self.assertEqual(uncached_parser.results.keys(), cached_parser.results.keys())
+        for unique_name, result in uncached_parser.results.items():
+            cached_result = cached_parser.results[unique_name]
+            self.assertEqual(result.scanned_tokens, cached_result.scanned_tokens)
+            self.assertEqual(result.scanned_import_dependencies, cached_result.scanned_import_dependencies)
+
+        self.assertTrue(uncached_analysis.statistics.data)
+        self.assertEqual(uncached_analysis.statistics.data, cached_analysis.statistics.data)
+
+    def test_generate_file_results_with_commented_includes(self):
+        """Check that commented includes are ignored and includes after one line block comments are still found."""
+        file_content = """
+/* Copyright (c) Microsoft Corporation. */
+#include "precomp.h"
+// #include "ignored_line_comment.h"
+/*
+#include "ignored_block_comment.h"
+*/
+#include <windows.h> // trailing comment
+const char* url = "http://localhost";
+const int limit = 1'000; /* don't
+#include "ignored_after_digit_separator.h"
+*/
+const char quote = '"';
+"""
+        self.parser.generate_file_result_from_analysis(self.analysis, file_name="comments.cpp", full_file_path="/tests/comments.cpp",
+                                                       file_content=file_content)
+
+        result = self.parser.results["/tests/comments.cpp"]
+        self.assertEqual(result.scanned_import_dependencies, ['precomp.h', 'windows.h'])
+
+    def test_generate_file_results_with_exotic_includes(self):
+        """Check that spaced directives, dashes in names and macro includes are extracted."""
+        file_content = """
+# include <foo-bar.h>
+  #include"baz.hpp"
+#include PLATFORM_HEADER
+"""
+        self.parser.generate_file_result_from_analysis(self.analysis, file_name="exotic.cpp", full_file_path="/tests/exotic.cpp",
+                                                       file_content=file_content)
+
+        result = self.parser.results["/tests/exotic.cpp"]
+        self.assertEqual(result.scanned_import_dependencies, ['foo-bar.h', 'baz.hpp', 'PLATFORM_HEADER'])
@@ -82,3 +82,14 @@ class ParsingMixinTestCase(unittest.TestCase):
         )
         
         self.assertTrue(resolved_dependency2 == expected_resolved_dependency2_path)
+
+    def test_generate_token_list_by_translation(self):
+        """Test that the translation based token generation equals the mapping based one."""
+
+        mapping = {':': ' : ', ';': ' ; ', '<': ' < ', '>': ' > ', '"': ' " '}
+        file_content = '#include <vector>\n#include "foo.h"\nstd::vector<int> v;\n'
+
+        tokens_by_mapping = ParsingMixin.preprocess_file_content_and_generate_token_list_by_mapping(file_content, mapping)
+        translation_table = str.maketrans(mapping)
+        tokens_by_translation = ParsingMixin.preprocess_file_content_and_generate_token_list_by_translation(file_content, translation_table)
+        self.assertEqual(tokens_by_mapping, tokens_by_translation)